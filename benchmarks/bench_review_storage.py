@@ -0,0 +1,160 @@
+"""
+Compare database size and lr / lrs latency with review text stored
+inline in Review against the compressed, deduplicated ReviewText storage.
+
+Usage:
+    python benchmarks/bench_review_storage.py [students] [reviews_each]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import capstone_project  # noqa: E402
+
+SQL_SCRIPT = Path(__file__).resolve().parent.parent / 'create_database.sql'
+HEAVY_STUDENT_ID = 'HS00000000000'
+HEAVY_REVIEWS = 3000
+LOOKUPS = 200
+WORDS = [
+    'code', 'comments', 'efficient', 'solution', 'style', 'task', 'well',
+    'documented', 'readable', 'variable', 'names', 'function', 'loop',
+    'needs', 'work', 'great', 'improve', 'structure', 'logic', 'test',
+]
+
+
+def reviewText(boilerplate: list[str]) -> str:
+    """
+    A function that returns a boilerplate review 80% of the time and a
+    unique review otherwise.
+    """
+    if random.random() < 0.8:
+        return random.choice(boilerplate)
+    return ' '.join(random.choices(WORDS, k=random.randint(20, 80)))
+
+
+def buildDatabase(path: Path, students: int, reviews_each: int) -> None:
+    """
+    A function that creates the database from create_database.sql and
+    adds students with reviews, plus one student with HEAVY_REVIEWS
+    reviews, then builds their transcripts.
+
+    Args:
+        path: Path.
+            Where to create the database
+        students: int.
+            The number of students to add
+        reviews_each: int.
+            The number of reviews for each added student
+
+    Returns:
+        None
+    """
+    random.seed(1)
+    boilerplate = [
+        ' '.join(random.choices(WORDS, k=random.randint(40, 120)))
+        for _ in range(50)
+    ]
+    student_reviews = [(HEAVY_STUDENT_ID, HEAVY_REVIEWS)] + [
+        (f'BS{i:011d}', reviews_each) for i in range(students)
+    ]
+
+    with capstone_project.openDatabase(path) as conn:
+        capstone_project.cursor = conn.cursor()
+        conn.executescript(SQL_SCRIPT.read_text(encoding='utf-8'))
+        review_id = 1000
+        for student_id, total in student_reviews:
+            conn.execute(
+                "INSERT INTO Student VALUES (?, 'First', 'Last', ?, 1)",
+                (student_id, f'{student_id}@email.com')
+            )
+            rows = []
+            for _ in range(total):
+                review_id += 1
+                rows.append((review_id, reviewText(boilerplate), student_id))
+            conn.executemany(
+                """
+                INSERT INTO Review (
+                review_id, review_text, completeness, efficiency, style,
+                documentation, student_id, course_code)
+                VALUES (?, ?, 1, 2, 3, 4, ?, 'DS01')
+                """,
+                rows
+            )
+        # Build each changed transcript once
+        capstone_project.refreshTranscripts()
+        conn.commit()
+
+
+def vacuumedSize(path: Path) -> float:
+    """
+    A function that returns the size of the database in MB after
+    VACUUM.
+    """
+    with capstone_project.openDatabase(path) as conn:
+        conn.execute("VACUUM")
+    return os.path.getsize(path) / 1e6
+
+
+def timeLookups(path: Path, student_id: str, include_text: bool) -> float:
+    """
+    A function that returns the mean time of reviewTextByStudentID in
+    milliseconds.
+    """
+    with capstone_project.openDatabase(path) as conn:
+        capstone_project.cursor = conn.cursor()
+        start = time.perf_counter()
+        for _ in range(LOOKUPS):
+            capstone_project.reviewTextByStudentID(student_id, include_text)
+        return (time.perf_counter() - start) / LOOKUPS * 1000
+
+
+def main() -> None:
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    reviews_each = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as directory:
+        inline_path = Path(directory) / 'inline.db'
+        compressed_path = Path(directory) / 'compressed.db'
+
+        start = time.perf_counter()
+        buildDatabase(inline_path, students, reviews_each)
+        print(f'build:                {time.perf_counter() - start:.1f} s')
+
+        shutil.copy(inline_path, compressed_path)
+        with capstone_project.openDatabase(compressed_path) as conn:
+            capstone_project.cursor = conn.cursor()
+            start = time.perf_counter()
+            capstone_project.compressReviewText()
+            conn.commit()
+            print(f'compressReviewText:   '
+                  f'{time.perf_counter() - start:.1f} s')
+
+        with capstone_project.openDatabase(inline_path) as conn:
+            reviews = conn.execute("SELECT COUNT(*) FROM Review").fetchone()
+        print(f'reviews:              {reviews[0]}')
+        print(f'{"":22}{"inline":>12}{"compressed":>14}')
+        print(f'{"size (MB)":22}{vacuumedSize(inline_path):12.1f}'
+              f'{vacuumedSize(compressed_path):14.1f}')
+
+        cases = [
+            (f'lr ({reviews_each} reviews, ms)', 'BS00000000000', True),
+            (f'lrs ({reviews_each} reviews, ms)', 'BS00000000000', False),
+            (f'lr ({HEAVY_REVIEWS} reviews, ms)', HEAVY_STUDENT_ID, True),
+            (f'lrs ({HEAVY_REVIEWS} reviews, ms)', HEAVY_STUDENT_ID, False),
+        ]
+        for label, student_id, include_text in cases:
+            inline = timeLookups(inline_path, student_id, include_text)
+            compressed = timeLookups(
+                compressed_path, student_id, include_text
+            )
+            print(f'{label:22}{inline:12.3f}{compressed:14.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Compare a full student profile read from the precomputed StudentTranscript
+table against the vs, lr and la queries it replaces.
+
+Usage:
+    python benchmarks/bench_transcripts.py [extra_students]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import capstone_project  # noqa: E402
+
+SQL_SCRIPT = Path(__file__).resolve().parent.parent / 'create_database.sql'
+LOOKUPS = 2000
+
+
+def addExtraStudents(conn, extra_students: int) -> None:
+    """
+    A function that adds students to the database, each taking three
+    courses with a review per course.
+
+    Args:
+        conn: sqlite3.Connection.
+            Connection to the benchmark database
+        extra_students: int.
+            The number of students to add
+
+    Returns:
+        None
+    """
+    courses = [
+        row[0] for row in conn.execute("SELECT course_code FROM Course")
+    ]
+    random.seed(1)
+    for i in range(extra_students):
+        student_id = f'BS{i:011d}'
+        conn.execute(
+            "INSERT INTO Student VALUES (?, ?, ?, ?, ?)",
+            (student_id, f'First{i}', f'Last{i}', f'{i}@email.com',
+             random.randint(1, 33))
+        )
+        for j, course_code in enumerate(random.sample(courses, 3)):
+            conn.execute(
+                "INSERT INTO StudentCourse VALUES (?, ?, ?, ?)",
+                (student_id, course_code, random.randint(0, 100),
+                 random.randint(0, 1))
+            )
+            conn.execute(
+                """
+                INSERT INTO Review (
+                review_id, review_text, completeness, efficiency, style,
+                documentation, student_id, course_code)
+                VALUES (?, ?, 1, 2, 3, 4, ?, ?)
+                """,
+                (1000 + i * 3 + j, f'Review {i} {j}', student_id,
+                 course_code)
+            )
+    conn.commit()
+
+
+def timeLookups(lookup) -> float:
+    """
+    A function that returns the mean time of a lookup in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        lookup()
+    return (time.perf_counter() - start) / LOOKUPS * 1e6
+
+
+def main() -> None:
+    extra_students = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    with tempfile.TemporaryDirectory() as directory:
+        with capstone_project.openDatabase(
+            Path(directory) / 'bench.db'
+        ) as conn:
+            capstone_project.cursor = conn.cursor()
+            conn.executescript(SQL_SCRIPT.read_text(encoding='utf-8'))
+
+            start = time.perf_counter()
+            addExtraStudents(conn, extra_students)
+            capstone_project.refreshTranscripts()
+            load_time = time.perf_counter() - start
+
+            student_id = 'PP00100200311'
+
+            def joinedLookup():
+                capstone_project.courseNameByCourseCode(student_id)
+                capstone_project.reviewTextByStudentID(student_id)
+                capstone_project.addressByNameAndSurname('Peter', 'Parker')
+
+            def transcriptLookup():
+                capstone_project.transcriptByStudentID(student_id)
+
+            print(f'extra students:        {extra_students}')
+            print(f'load and refresh:      {load_time:.2f} s')
+            print(f'vs + lr + la queries:  {timeLookups(joinedLookup):.1f} us')
+            print(f'transcriptByStudentID: '
+                  f'{timeLookups(transcriptLookup):.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 # -------------------------- Import Libraries -------------------------
 
 import sqlite3
+import hashlib
+import zlib
 from contextlib import contextmanager
+from functools import lru_cache
 import tabulate
 import json
 import xml.etree.ElementTree as ET
@@ -135,6 +138,19 @@ def storeDataAsXML(data: list[tuple], filename: str) -> None:
             review_element = ET.SubElement(tuple_element, "review")
             review_element.text = (element['Review'])
 
+    elif command == 'lrs':
+        # Create the root element
+        root = ET.Element("data")
+        for element in data:
+            # Create the sub element as the children of the root element
+            tuple_element = ET.SubElement(root, "tuple")
+
+            # Create the sub elements as the children of the tuple element
+            for key in ['Completeness', 'Efficiency', 'Style',
+                        'Documentation']:
+                score_element = ET.SubElement(tuple_element, key.lower())
+                score_element.text = str(element[key])
+
     elif command == 'lc':
         # Create the root element
         root = ET.Element("data")
@@ -202,6 +218,35 @@ def storeDataAsXML(data: list[tuple], filename: str) -> None:
             marks_element = ET.SubElement(tuple_element, "mark")
             marks_element.text = str(element['Marks'])
 
+    elif command == 'vt':
+        # Create the root element
+        root = ET.Element("data")
+        # Iterate over transcripts in the data list
+        for element in data:
+            # Create the sub element to come below the root element
+            student_element = ET.SubElement(root, "student")
+            for key in ['student_id', 'first_name', 'last_name', 'email']:
+                ET.SubElement(student_element, key).text = element[key]
+
+            # Create the address element below the student element
+            address_element = ET.SubElement(student_element, "address")
+            for key, value in (element['address'] or {}).items():
+                ET.SubElement(address_element, key).text = str(value)
+
+            # Create an element per course and review below the
+            # student element
+            courses_element = ET.SubElement(student_element, "courses")
+            for course in element['courses']:
+                course_element = ET.SubElement(courses_element, "course")
+                for key, value in course.items():
+                    ET.SubElement(course_element, key).text = str(value)
+
+            reviews_element = ET.SubElement(student_element, "reviews")
+            for review in element['reviews']:
+                review_element = ET.SubElement(reviews_element, "review")
+                for key, value in review.items():
+                    ET.SubElement(review_element, key).text = str(value)
+
     # Convert the tree to a string and indent for readability
     tree = ET.ElementTree(root)
     # Indentation for readability
@@ -254,6 +299,23 @@ def usageIsIncorrect(input: list[str], num_args: int) -> bool:
     return False
 
 
+# Cache decompressed text, as deduplicated reviews are read repeatedly
+@lru_cache(maxsize=1024)
+def inflateReviewText(compressed_text: bytes) -> str:
+    """
+    A function that decompresses review text stored in the ReviewText
+    table.
+
+    Args:
+        compressed_text: bytes.
+            The zlib-compressed review text
+
+    Returns:
+        str
+    """
+    return zlib.decompress(compressed_text).decode('utf-8')
+
+
 # Use contextmanager as decorator which enables us to borrow the
 # functionality of the contextmanager function, without altering the
 # function itself.
@@ -351,36 +413,64 @@ def addressByNameAndSurname(first_name: str, surname: str) -> list[tuple]:
     return queried_table.fetchall()
 
 
-def reviewTextByStudentID(student_id: str) -> list[tuple]:
+def reviewTextByStudentID(student_id: str,
+                          include_text: bool = True) -> list[tuple]:
     """
     A function that queries the HyperionDev.db to return a list of
-    tuples
+    tuples. Review text that has been moved to the ReviewText table is
+    only read and decompressed when include_text is True.
 
     Args:
         student_id: str.
             The student id of a student in the HyperionDev.db
+        include_text: bool.
+            Whether to return the review text after the scores
 
     Returns:
         queried_table: list.
             List of tuples representing the queried data from
             HyperionDev.db
     """
+    if not include_text:
+        queried_table = (
+            cursor.execute(
+                """
+                SELECT
+                    r.completeness, r.efficiency, r.style, r.documentation
+                FROM Student AS s
+                LEFT JOIN Review AS r
+                ON r.student_id = s.student_id
+                WHERE s.student_id=:query
+                """,
+                {'query': student_id}
+            )
+        )
+
+        return queried_table.fetchall()
+
     queried_table = (
         cursor.execute(
             """
             SELECT
                 r.completeness, r.efficiency, r.style, r.documentation,
-                r.review_text
-            FROM Review AS r
-            RIGHT JOIN  Student as s
+                r.review_text, rt.compressed_text
+            FROM Student AS s
+            LEFT JOIN Review AS r
             ON r.student_id = s.student_id
+            LEFT JOIN ReviewText AS rt
+            ON r.review_text IS NULL AND r.text_hash = rt.text_hash
             WHERE s.student_id=:query
             """,
             {'query': student_id}
         )
     )
 
-    return queried_table.fetchall()
+    # Decompress the review text of reviews stored only in ReviewText
+    return [
+        (*scores, review_text if compressed_text is None
+         else inflateReviewText(compressed_text))
+        for *scores, review_text, compressed_text in queried_table
+    ]
 
 
 def courseNameByTeacherID(teacher_id: str) -> list[tuple]:
@@ -484,6 +574,146 @@ def studentCompletedBelow30() -> list[tuple]:
     return queried_table.fetchall()
 
 
+def refreshTranscripts(student_id: str | None = None) -> None:
+    """
+    A function that rebuilds the transcripts the database triggers have
+    marked as changed in StudentTranscriptDirty. Each changed transcript
+    is rebuilt once, however many of its rows were written.
+
+    Args:
+        student_id: str.
+            Only refresh the transcript of this student. All changed
+            transcripts are refreshed if it is None
+
+    Returns:
+        None
+    """
+    if student_id is None:
+        cursor.execute("DELETE FROM StudentTranscriptDirty")
+    else:
+        cursor.execute(
+            """
+            DELETE FROM StudentTranscriptDirty
+            WHERE student_id=:query
+            """,
+            {'query': student_id}
+        )
+
+
+def transcriptByStudentID(student_id: str) -> dict | None:
+    """
+    A function that looks up the precomputed transcript of a student
+    in the HyperionDev.db. The transcript is refreshed first if its
+    rows have changed since it was built, so no joins are run at lookup
+    time otherwise. Review text stored in the ReviewText table is
+    decompressed here, and is None if its ReviewText row is missing.
+
+    Args:
+        student_id: str.
+            The student id of a student in the HyperionDev.db
+
+    Returns:
+        transcript: dict.
+            The student's details, address, courses and reviews, or
+            None if the student does not exist
+    """
+    refreshTranscripts(student_id)
+
+    queried_table = (
+        cursor.execute(
+            """
+            SELECT transcript
+            FROM StudentTranscript
+            WHERE student_id=:query
+            """,
+            {'query': student_id}
+        )
+    )
+    row = queried_table.fetchone()
+
+    if row is None:
+        return None
+    transcript = json.loads(row[0])
+
+    # Reviews stored only in ReviewText, keyed by their text_hash
+    compressed_reviews = {}
+    for review in transcript['reviews']:
+        text_hash = review.pop('text_hash')
+        if review['review_text'] is None and text_hash is not None:
+            compressed_reviews.setdefault(
+                bytes.fromhex(text_hash), []
+            ).append(review)
+
+    # Fetch the compressed text in batches, staying below SQLite's limit
+    # on the number of query parameters
+    text_hashes = list(compressed_reviews)
+    for start in range(0, len(text_hashes), 500):
+        batch = text_hashes[start:start + 500]
+        queried_table = cursor.execute(
+            f"""
+            SELECT text_hash, compressed_text
+            FROM ReviewText
+            WHERE text_hash IN ({', '.join('?' * len(batch))})
+            """,
+            batch
+        )
+        for text_hash, compressed_text in queried_table:
+            review_text = inflateReviewText(compressed_text)
+            for review in compressed_reviews[text_hash]:
+                review['review_text'] = review_text
+
+    return transcript
+
+
+def compressReviewText() -> None:
+    """
+    A function that moves the review text of every review in the
+    HyperionDev.db into the ReviewText table. The text is compressed
+    with zlib and stored once per distinct review, keyed by its SHA-256
+    hash, so repeated reviews share a single row. The database
+    triggers remove rows in ReviewText once no review refers to them.
+
+    The transcripts of the affected students are rebuilt once at the
+    end.
+
+    Returns:
+        None
+    """
+    reviews = (
+        cursor.execute(
+            """
+            SELECT review_id, review_text
+            FROM Review
+            WHERE review_text IS NOT NULL
+            """
+        )
+    ).fetchall()
+
+    for review_id, review_text in reviews:
+        encoded_text = review_text.encode('utf-8')
+        text_hash = hashlib.sha256(encoded_text).digest()
+
+        # Store the compressed text only for the first review using it
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO ReviewText
+            VALUES (:text_hash, :compressed_text)
+            """,
+            {'text_hash': text_hash,
+             'compressed_text': zlib.compress(encoded_text, 9)}
+        )
+        cursor.execute(
+            """
+            UPDATE Review
+            SET review_text = NULL, text_hash = :text_hash
+            WHERE review_id = :review_id
+            """,
+            {'text_hash': text_hash, 'review_id': review_id}
+        )
+
+    refreshTranscripts()
+
+
 def offerToStore(data):
     """
     A function that requests the user whether they wish to save the
@@ -518,160 +748,226 @@ def offerToStore(data):
 
 # ------------------ Execute SQL file to the database -----------------
 
+# Only set up the database and start the application when run as a
+# script, so the functions above can be imported
+if __name__ == '__main__':
+    # Set to True to store review text compressed and deduplicated in the
+    # ReviewText table instead of inline in the Review table
+    COMPRESS_REVIEW_TEXT = False
+
+    with openDatabase('HyperionDev.db') as conn:
+        cursor = conn.cursor()
 
-with openDatabase('HyperionDev.db') as conn:
-    cursor = conn.cursor()
+        # Load and execute the SQL file into the HyperionDev database
+        with open('create_database.sql', 'r', encoding='utf-8') as file:
+            sql_script = file.read()
 
-    # Load and execute the SQL file into the HyperionDev database
-    with open('create_database.sql', 'r', encoding='utf-8') as file:
-        sql_script = file.read()
+        cursor.executescript(sql_script)
 
-    cursor.executescript(sql_script)
-    conn.commit()
+        if COMPRESS_REVIEW_TEXT:
+            compressReviewText()
+        conn.commit()
 
-# -------------------------- Main Application -------------------------
+    # -------------------------- Main Application -------------------------
 
-# Store the applications 'landing menu' as a docstring
-usage = '''
+    # Store the applications 'landing menu' as a docstring
+    usage = '''
 What would you like to do?
 
 d                          - Demo
 vs <student_id>            - View subjects taken by a student
 la <firstname> <surname>   - Lookup address for a given firstname and surname
 lr <student_id>            - All reviews for a given student_id
+lrs <student_id>           - All review scores, without the review text, for
+                             a given student_id
 lc <teacher_id>            - All courses being given by teacher_id
 lnc                        - All students who haven't completed their course
 lf                         - All students who have completed their course and
                              achieved 30 or below
+vt <student_id>            - View the full transcript for a given student_id
 e                          - exit this program
 
 Type your option here: '''
 
-print("Welcome to the data querying app!")
-
-while True:
-    print()
-    # Get input from user.
-    # Split the input string into a list of strings.
-    user_input = input(usage).split(" ")
-
-    # Parse user input into command and args
-    # Store the first string in the user_input list as command
-    command = user_input[0]
-
-    # If the length of the user_input list is greater than 1, then
-    # list values of user_input as variable args, excluding the
-    # first element
-    if len(user_input) > 1:
-        args = user_input[1:]
-
-    # Return the firstname and the surname for each student
-    if command == 'd':
-        print('😁 A nice bit of code from me to you - this', end=' ')
-        print('prints all student names and surnames:\n')
-        with openDatabase('HyperionDev.db') as conn:
-            cursor = conn.cursor()
-            data = cursor.execute("SELECT * FROM Student")
-            data = data.fetchall()
-            for _, firstname, surname, _, _ in data:
-                print(f"{firstname} {surname}")
-
-    # View courses by student_id
-    elif command == 'vs':
-        if usageIsIncorrect(user_input, 1):
-            continue
-        student_id = args[0]
-        data = None
-        with openDatabase('HyperionDev.db') as conn:
-            cursor = conn.cursor()
-            data = courseNameByCourseCode(student_id)
-            headings = ['Subjects']
-        tableFormat(data, headings)
-        offerToStore(formatting(data, headings))
-
-    # View the address by student name and surname
-    elif command == 'la':
-        if usageIsIncorrect(user_input, 2):
-            continue
-        name = args[0]
-        surname = args[1]
-        data = None
-        with openDatabase('HyperionDev.db') as conn:
-            cursor = conn.cursor()
-            data = addressByNameAndSurname(name, surname)
-            headings = ['Street Name', 'City']
-        tableFormat(data, headings)
-        offerToStore(formatting(data, headings))
-
-    # View the reviews by student IDs
-    elif command == 'lr':
-        if usageIsIncorrect(user_input, 1):
-            continue
-        student_id = args[0]
-        data = None
-        with openDatabase('HyperionDev.db') as conn:
-            cursor = conn.cursor()
-            data = reviewTextByStudentID(student_id)
-
-            # Iterate over the list of tuples.
-            for tuple_data in data:
-                # Unpack each tuple
-                completeness, efficiency, style, \
-                    documentation, review = tuple_data
-
-                # Store the desired string format
-                string_format = (
-                    f'\nCompleteness : {completeness}\n'
-                    f'Efficiency   : {efficiency}\n'
-                    f'Style        : {style}\n'
-                    f'Documentation: {documentation}\n'
-                    f'Review       : {review}'
-                )
-                print(f'{string_format}\n')
-            headings = ['Completeness', 'Efficiency', 'Style',
-                        'Documentation', 'Review']
-        offerToStore(formatting(data, headings))
-
-    # View course name by the teacher id
-    elif command == 'lc':
-        if usageIsIncorrect(user_input, 1):
-            continue
-        teacher_id = args[0]
-        data = None
-        with openDatabase('HyperionDev.db') as conn:
-            cursor = conn.cursor()
-            data = courseNameByTeacherID(teacher_id)
-            headings = ['Subjects']
-        tableFormat(data, headings)
-        offerToStore(formatting(data, headings))
-
-    # View the total number of students that have not completed their
-    # courses
-    elif command == 'lnc':
-        data = None
-        with openDatabase('HyperionDev.db') as conn:
-            cursor = conn.cursor()
-            data = incompleteStudents()
-            headings = ['Student ID', 'First Name', 'Last Name',
-                        'Email Address', 'Course']
-        tableFormat(data, headings)
-        offerToStore(formatting(data, headings))
-
-    # View the total students who have completed their courses with
-    # a mark lower than 30
-    elif command == 'lf':
-        data = None
-        with openDatabase('HyperionDev.db') as conn:
-            cursor = conn.cursor()
-            data = studentCompletedBelow30()
-            headings = ['Student ID', 'First Name', 'Last Name',
-                        'Email Address', 'Course', 'Marks']
-        tableFormat(data, headings)
-        offerToStore(formatting(data, headings))
-
-    elif command == 'e':
-        print("\nProgramme exited successfully!\n")
-        break
+    print("Welcome to the data querying app!")
 
-    else:
-        print(f"Incorrect command: '{command}'")
+    while True:
+        print()
+        # Get input from user.
+        # Split the input string into a list of strings.
+        user_input = input(usage).split(" ")
+
+        # Parse user input into command and args
+        # Store the first string in the user_input list as command
+        command = user_input[0]
+
+        # If the length of the user_input list is greater than 1, then
+        # list values of user_input as variable args, excluding the
+        # first element
+        if len(user_input) > 1:
+            args = user_input[1:]
+
+        # Return the firstname and the surname for each student
+        if command == 'd':
+            print('😁 A nice bit of code from me to you - this', end=' ')
+            print('prints all student names and surnames:\n')
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = cursor.execute("SELECT * FROM Student")
+                data = data.fetchall()
+                for _, firstname, surname, _, _ in data:
+                    print(f"{firstname} {surname}")
+
+        # View courses by student_id
+        elif command == 'vs':
+            if usageIsIncorrect(user_input, 1):
+                continue
+            student_id = args[0]
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = courseNameByCourseCode(student_id)
+                headings = ['Subjects']
+            tableFormat(data, headings)
+            offerToStore(formatting(data, headings))
+
+        # View the address by student name and surname
+        elif command == 'la':
+            if usageIsIncorrect(user_input, 2):
+                continue
+            name = args[0]
+            surname = args[1]
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = addressByNameAndSurname(name, surname)
+                headings = ['Street Name', 'City']
+            tableFormat(data, headings)
+            offerToStore(formatting(data, headings))
+
+        # View the reviews by student IDs
+        elif command == 'lr':
+            if usageIsIncorrect(user_input, 1):
+                continue
+            student_id = args[0]
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = reviewTextByStudentID(student_id)
+
+                # Iterate over the list of tuples.
+                for tuple_data in data:
+                    # Unpack each tuple
+                    completeness, efficiency, style, \
+                        documentation, review = tuple_data
+
+                    # Store the desired string format
+                    string_format = (
+                        f'\nCompleteness : {completeness}\n'
+                        f'Efficiency   : {efficiency}\n'
+                        f'Style        : {style}\n'
+                        f'Documentation: {documentation}\n'
+                        f'Review       : {review}'
+                    )
+                    print(f'{string_format}\n')
+                headings = ['Completeness', 'Efficiency', 'Style',
+                            'Documentation', 'Review']
+            offerToStore(formatting(data, headings))
+
+        # View the review scores by student IDs, without the review text
+        elif command == 'lrs':
+            if usageIsIncorrect(user_input, 1):
+                continue
+            student_id = args[0]
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = reviewTextByStudentID(student_id, include_text=False)
+                headings = ['Completeness', 'Efficiency', 'Style',
+                            'Documentation']
+            tableFormat(data, headings)
+            offerToStore(formatting(data, headings))
+
+        # View course name by the teacher id
+        elif command == 'lc':
+            if usageIsIncorrect(user_input, 1):
+                continue
+            teacher_id = args[0]
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = courseNameByTeacherID(teacher_id)
+                headings = ['Subjects']
+            tableFormat(data, headings)
+            offerToStore(formatting(data, headings))
+
+        # View the total number of students that have not completed their
+        # courses
+        elif command == 'lnc':
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = incompleteStudents()
+                headings = ['Student ID', 'First Name', 'Last Name',
+                            'Email Address', 'Course']
+            tableFormat(data, headings)
+            offerToStore(formatting(data, headings))
+
+        # View the total students who have completed their courses with
+        # a mark lower than 30
+        elif command == 'lf':
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = studentCompletedBelow30()
+                headings = ['Student ID', 'First Name', 'Last Name',
+                            'Email Address', 'Course', 'Marks']
+            tableFormat(data, headings)
+            offerToStore(formatting(data, headings))
+
+        # View the precomputed transcript by student ID
+        elif command == 'vt':
+            if usageIsIncorrect(user_input, 1):
+                continue
+            student_id = args[0]
+            data = None
+            with openDatabase('HyperionDev.db') as conn:
+                cursor = conn.cursor()
+                data = transcriptByStudentID(student_id)
+                # Keep the transcript if it had to be refreshed
+                conn.commit()
+
+            if data is None:
+                print(f"No student found with student_id '{student_id}'")
+                continue
+
+            print(f"\n{data['first_name']} {data['last_name']} "
+                  f"({data['student_id']}) - {data['email']}")
+            address = data['address']
+            if address is not None:
+                print(f"{address['street']}, {address['city']}")
+
+            # Display the courses and reviews as tables
+            courses = [
+                (course['course_code'], course['course_name'],
+                 course['mark'], course['is_complete'])
+                for course in data['courses']
+            ]
+            tableFormat(courses, ['Course Code', 'Course', 'Mark', 'Complete'])
+
+            reviews = [
+                (review['course_code'], review['completeness'],
+                 review['efficiency'], review['style'],
+                 review['documentation'], review['review_text'])
+                for review in data['reviews']
+            ]
+            tableFormat(reviews, ['Course Code', 'Completeness', 'Efficiency',
+                                  'Style', 'Documentation', 'Review'])
+            offerToStore([data])
+
+        elif command == 'e':
+            print("\nProgramme exited successfully!\n")
+            break
+
+        else:
+            print(f"Incorrect command: '{command}'")
@@ -195,23 +195,38 @@ VALUES
 ('WT00100200327','DS01', NULL, 0);
 
 
+DROP TABLE IF EXISTS ReviewText;
+
+-- zlib-compressed review text, deduplicated by the SHA-256 hash of the
+-- original text. Only used once the compressed storage mode has moved
+-- the text out of Review, see compressReviewText in capstone_project.py.
+CREATE TABLE ReviewText (
+text_hash BLOB PRIMARY KEY,
+compressed_text BLOB NOT NULL);
+
+
+
 DROP TABLE IF EXISTS Review;
 
 CREATE TABLE Review (
 review_id INT PRIMARY KEY,
-review_text TEXT NOT NULL,
+review_text TEXT CHECK(review_text IS NOT NULL OR text_hash IS NOT NULL),
 completeness INT CHECK(completeness IN (1, 2, 3, 4)),
 efficiency INT CHECK(efficiency IN (1, 2, 3, 4)),
 style INT CHECK(style IN (1, 2, 3, 4)),
 documentation INT CHECK(documentation IN (1, 2, 3, 4)),
 student_id CHAR(13),
 course_code CHAR(5),
+text_hash BLOB,
 
 FOREIGN KEY(student_id) REFERENCES StudentCourse(student_id),
-FOREIGN KEY(course_code) REFERENCES StudentCourse(course_code)
+FOREIGN KEY(course_code) REFERENCES StudentCourse(course_code),
+FOREIGN KEY(text_hash) REFERENCES ReviewText(text_hash)
 );
 
-INSERT INTO Review 
+INSERT INTO Review (
+review_id, review_text, completeness, efficiency, style, documentation,
+student_id, course_code)
 VALUES
 
 (1, 'Needs work!', 1, 1, 1, 1, 'JV00100200304','DS02'),
@@ -249,4 +264,245 @@ VALUES
 (33, 'Great comments! You can just optimize in a few areas.', 4, 1, 4, 4, 'DV00100200315','DB02'),
 (34, 'You did not pass!', 1, 1, 1, 1, 'GG00100200319','DB01'),
 (35, ':(', 1, 1, 1, 1, 'EP00100200324','SE01'),
-(36, 'I am something of a web developer myself.', 4, 4, 4, 4, 'PP00100200311','WD03');
\ No newline at end of file
+(36, 'I am something of a web developer myself.', 4, 4, 4, 4, 'PP00100200311','WD03');
+
+CREATE INDEX ReviewTextHashIndex ON Review(text_hash);
+
+-- Writing review_text replaces any compressed copy of the review.
+CREATE TRIGGER ReviewTextReplace
+AFTER UPDATE OF review_text ON Review
+WHEN NEW.review_text IS NOT NULL AND NEW.text_hash IS NOT NULL
+BEGIN
+    UPDATE Review SET text_hash = NULL WHERE review_id = NEW.review_id;
+END;
+
+-- Remove compressed text once no review refers to it.
+CREATE TRIGGER ReviewTextOrphanUpdate
+AFTER UPDATE OF text_hash ON Review
+WHEN OLD.text_hash IS NOT NULL AND OLD.text_hash IS NOT NEW.text_hash
+BEGIN
+    DELETE FROM ReviewText
+    WHERE text_hash = OLD.text_hash
+    AND NOT EXISTS (SELECT 1 FROM Review WHERE text_hash = OLD.text_hash);
+END;
+
+CREATE TRIGGER ReviewTextOrphanDelete
+AFTER DELETE ON Review
+WHEN OLD.text_hash IS NOT NULL
+BEGIN
+    DELETE FROM ReviewText
+    WHERE text_hash = OLD.text_hash
+    AND NOT EXISTS (SELECT 1 FROM Review WHERE text_hash = OLD.text_hash);
+END;
+
+
+-- Denormalised per-student transcript documents. Each row holds the
+-- student's details, address, courses and reviews as one compact JSON
+-- document, so a full profile can be read with a single primary key
+-- lookup instead of joining StudentCourse, Course, Review and Address.
+-- Review text that has been moved to ReviewText is stored as the hex
+-- text_hash of its ReviewText row and decompressed by the application.
+
+DROP VIEW IF EXISTS StudentTranscriptSource;
+
+CREATE VIEW StudentTranscriptSource AS
+SELECT
+    s.student_id,
+    json_object(
+        'student_id', s.student_id,
+        'first_name', s.first_name,
+        'last_name', s.last_name,
+        'email', s.email,
+        'address', json((
+            SELECT json_object(
+                'street', a.street,
+                'city', a.city,
+                'province', a.province,
+                'postal_code', a.postal_code,
+                'country', a.country)
+            FROM Address AS a
+            WHERE a.address_id = s.address_id)),
+        'courses', json((
+            SELECT json_group_array(json_object(
+                'course_code', sc.course_code,
+                'course_name', c.course_name,
+                'mark', sc.mark,
+                'is_complete', sc.is_complete))
+            FROM (
+                SELECT * FROM StudentCourse
+                WHERE student_id = s.student_id
+                ORDER BY course_code) AS sc
+            LEFT JOIN Course AS c
+            ON sc.course_code = c.course_code)),
+        'reviews', json((
+            SELECT json_group_array(json_object(
+                'review_id', r.review_id,
+                'course_code', r.course_code,
+                'completeness', r.completeness,
+                'efficiency', r.efficiency,
+                'style', r.style,
+                'documentation', r.documentation,
+                'review_text', r.review_text,
+                'text_hash', CASE
+                    WHEN r.text_hash IS NOT NULL
+                    THEN lower(hex(r.text_hash))
+                END))
+            FROM (
+                SELECT * FROM Review
+                WHERE student_id = s.student_id
+                ORDER BY review_id) AS r))
+    ) AS transcript
+FROM Student AS s;
+
+DROP TABLE IF EXISTS StudentTranscript;
+
+CREATE TABLE StudentTranscript (
+student_id CHAR(13) PRIMARY KEY,
+transcript TEXT NOT NULL,
+
+FOREIGN KEY(student_id) REFERENCES Student(student_id));
+
+INSERT INTO StudentTranscript
+SELECT student_id, transcript FROM StudentTranscriptSource;
+
+-- Indexes that let the view and the triggers below find a student's rows
+-- without scanning the whole table.
+
+CREATE INDEX StudentAddressIndex ON Student(address_id);
+
+CREATE INDEX StudentCourseCourseIndex ON StudentCourse(course_code);
+
+CREATE INDEX ReviewStudentIndex ON Review(student_id, review_id);
+
+-- Changes to the underlying tables only mark the affected students in
+-- StudentTranscriptDirty, so a bulk load does not rebuild a student's
+-- document once per inserted row. Deleting a student from
+-- StudentTranscriptDirty rebuilds their document, so
+--     DELETE FROM StudentTranscriptDirty;
+-- refreshes every changed document once, see refreshTranscripts in
+-- capstone_project.py.
+
+DROP TABLE IF EXISTS StudentTranscriptDirty;
+
+CREATE TABLE StudentTranscriptDirty (
+student_id CHAR(13) PRIMARY KEY);
+
+CREATE TRIGGER StudentTranscriptRefresh
+AFTER DELETE ON StudentTranscriptDirty
+BEGIN
+    DELETE FROM StudentTranscript WHERE student_id = OLD.student_id;
+    INSERT INTO StudentTranscript
+    SELECT student_id, transcript FROM StudentTranscriptSource
+    WHERE student_id = OLD.student_id;
+END;
+
+CREATE TRIGGER StudentTranscriptStudentInsert
+AFTER INSERT ON Student
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (NEW.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptStudentUpdate
+AFTER UPDATE ON Student
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (OLD.student_id), (NEW.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptStudentDelete
+AFTER DELETE ON Student
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (OLD.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptAddressInsert
+AFTER INSERT ON Address
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    SELECT student_id FROM Student
+    WHERE address_id = NEW.address_id;
+END;
+
+CREATE TRIGGER StudentTranscriptAddressUpdate
+AFTER UPDATE ON Address
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    SELECT student_id FROM Student
+    WHERE address_id IN (OLD.address_id, NEW.address_id);
+END;
+
+CREATE TRIGGER StudentTranscriptAddressDelete
+AFTER DELETE ON Address
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    SELECT student_id FROM Student
+    WHERE address_id = OLD.address_id;
+END;
+
+CREATE TRIGGER StudentTranscriptCourseInsert
+AFTER INSERT ON Course
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    SELECT student_id FROM StudentCourse
+    WHERE course_code = NEW.course_code;
+END;
+
+CREATE TRIGGER StudentTranscriptCourseUpdate
+AFTER UPDATE ON Course
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    SELECT student_id FROM StudentCourse
+    WHERE course_code IN (OLD.course_code, NEW.course_code);
+END;
+
+CREATE TRIGGER StudentTranscriptCourseDelete
+AFTER DELETE ON Course
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    SELECT student_id FROM StudentCourse
+    WHERE course_code = OLD.course_code;
+END;
+
+CREATE TRIGGER StudentTranscriptStudentCourseInsert
+AFTER INSERT ON StudentCourse
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (NEW.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptStudentCourseUpdate
+AFTER UPDATE ON StudentCourse
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (OLD.student_id), (NEW.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptStudentCourseDelete
+AFTER DELETE ON StudentCourse
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (OLD.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptReviewInsert
+AFTER INSERT ON Review
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (NEW.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptReviewUpdate
+AFTER UPDATE ON Review
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (OLD.student_id), (NEW.student_id);
+END;
+
+CREATE TRIGGER StudentTranscriptReviewDelete
+AFTER DELETE ON Review
+BEGIN
+    INSERT OR IGNORE INTO StudentTranscriptDirty
+    VALUES (OLD.student_id);
+END;
\ No newline at end of file
@@ -0,0 +1,25 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import capstone_project
+
+SQL_SCRIPT = Path(__file__).resolve().parent.parent / 'create_database.sql'
+
+
+@pytest.fixture
+def conn(tmp_path):
+    with capstone_project.openDatabase(tmp_path / 'test.db') as conn:
+        capstone_project.cursor = conn.cursor()
+        conn.executescript(SQL_SCRIPT.read_text(encoding='utf-8'))
+        yield conn
+
+
+@pytest.fixture
+def transcripts():
+    def read(conn, table):
+        rows = conn.execute(f"SELECT student_id, transcript FROM {table}")
+        return {student_id: json.loads(doc) for student_id, doc in rows}
+
+    return read
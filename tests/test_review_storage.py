@@ -0,0 +1,188 @@
+import sqlite3
+
+import pytest
+
+import capstone_project
+
+STUDENT_ID = 'PP00100200311'
+
+
+@pytest.fixture(autouse=True)
+def duplicate_review(conn):
+    # Add a boilerplate review that repeats an existing one
+    conn.execute(
+        """
+        INSERT INTO Review (
+        review_id, review_text, completeness, efficiency, style,
+        documentation, student_id, course_code)
+        VALUES (100, 'Perfect!', 4, 4, 4, 4, :student_id, 'WD03')
+        """,
+        {'student_id': STUDENT_ID}
+    )
+
+
+def test_compress_review_text(conn, transcripts):
+    reviews = capstone_project.reviewTextByStudentID(STUDENT_ID)
+    transcript = capstone_project.transcriptByStudentID(STUDENT_ID)
+
+    capstone_project.compressReviewText()
+
+    assert conn.execute(
+        "SELECT COUNT(*) FROM Review WHERE review_text IS NOT NULL"
+    ).fetchone()[0] == 0
+    # Each distinct review text is stored once
+    assert conn.execute("SELECT COUNT(*) FROM Review").fetchone()[0] == 37
+    assert conn.execute("SELECT COUNT(*) FROM ReviewText").fetchone()[0] == 36
+    assert capstone_project.reviewTextByStudentID(STUDENT_ID) == reviews
+    assert capstone_project.transcriptByStudentID(STUDENT_ID) == transcript
+    assert (
+        transcripts(conn, 'StudentTranscript')
+        == transcripts(conn, 'StudentTranscriptSource')
+    )
+
+
+def test_scores_without_text(conn):
+    capstone_project.compressReviewText()
+
+    scores = capstone_project.reviewTextByStudentID(
+        STUDENT_ID, include_text=False
+    )
+
+    assert scores == [
+        review[:4]
+        for review in capstone_project.reviewTextByStudentID(STUDENT_ID)
+    ]
+
+
+def test_writes_after_compression_refresh_transcript(conn, transcripts):
+    capstone_project.compressReviewText()
+
+    conn.executescript(
+        """
+        UPDATE Review SET style = 1 WHERE review_id = 8;
+        UPDATE Review SET review_text = 'Edited' WHERE review_id = 29;
+        """
+    )
+    capstone_project.refreshTranscripts()
+
+    assert (
+        transcripts(conn, 'StudentTranscript')
+        == transcripts(conn, 'StudentTranscriptSource')
+    )
+    # Both readers return the new inline text
+    assert 'Edited' in [
+        review['review_text'] for review
+        in capstone_project.transcriptByStudentID(STUDENT_ID)['reviews']
+    ]
+    assert 'Edited' in [
+        review[4]
+        for review in capstone_project.reviewTextByStudentID(STUDENT_ID)
+    ]
+    assert conn.execute(
+        "SELECT text_hash FROM Review WHERE review_id = 29"
+    ).fetchone()[0] is None
+
+
+@pytest.mark.parametrize('statement', [
+    """
+    UPDATE Review SET review_text = 'Inline again', text_hash = NULL
+    WHERE review_id = 36
+    """,
+    """
+    UPDATE Review
+    SET student_id = 'JV00100200304', review_text = 'Moved', text_hash = NULL
+    WHERE review_id = 36
+    """,
+], ids=['inline again', 'move student'])
+def test_updates_changing_text_hash_refresh_transcript(conn, transcripts,
+                                                      statement):
+    capstone_project.compressReviewText()
+
+    conn.execute(statement)
+    capstone_project.refreshTranscripts()
+
+    assert (
+        transcripts(conn, 'StudentTranscript')
+        == transcripts(conn, 'StudentTranscriptSource')
+    )
+    for student_id in [STUDENT_ID, 'JV00100200304']:
+        transcript = capstone_project.transcriptByStudentID(student_id)
+        assert [
+            review['review_text'] for review in transcript['reviews']
+        ] == [
+            review[4] for review
+            in capstone_project.reviewTextByStudentID(student_id)
+        ]
+
+
+def test_unreferenced_review_text_is_removed(conn):
+    capstone_project.compressReviewText()
+
+    def storedTexts():
+        return conn.execute("SELECT COUNT(*) FROM ReviewText").fetchone()[0]
+
+    # Review 100 still refers to the text of review 29
+    conn.execute("DELETE FROM Review WHERE review_id = 29")
+    assert storedTexts() == 36
+    conn.execute("DELETE FROM Review WHERE review_id = 100")
+    assert storedTexts() == 35
+    conn.execute("UPDATE Review SET review_text = 'New' WHERE review_id = 8")
+    assert storedTexts() == 34
+
+
+def test_transcript_fetches_review_text_in_one_query(conn):
+    capstone_project.compressReviewText()
+    capstone_project.transcriptByStudentID(STUDENT_ID)
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    transcript = capstone_project.transcriptByStudentID(STUDENT_ID)
+    conn.set_trace_callback(None)
+
+    assert len(transcript['reviews']) == 4
+    assert len([
+        statement for statement in statements if 'ReviewText' in statement
+    ]) == 1
+
+
+def test_missing_review_text_row(conn):
+    capstone_project.compressReviewText()
+    conn.execute("DELETE FROM ReviewText")
+
+    transcript = capstone_project.transcriptByStudentID(STUDENT_ID)
+
+    assert [review['review_text'] for review in transcript['reviews']] == [
+        None, None, None, None
+    ]
+    assert [
+        review[4]
+        for review in capstone_project.reviewTextByStudentID(STUDENT_ID)
+    ] == [None, None, None, None]
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_schema_does_not_need_application_functions(conn, transcripts,
+                                                    tmp_path, compress):
+    if compress:
+        capstone_project.compressReviewText()
+    conn.commit()
+
+    # A connection that was not opened through openDatabase
+    plain_conn = sqlite3.connect(tmp_path / 'test.db')
+    plain_conn.executescript(
+        """
+        UPDATE Review SET style = 2 WHERE review_id = 8;
+        INSERT INTO Review (
+        review_id, review_text, completeness, efficiency, style,
+        documentation, student_id, course_code)
+        VALUES (101, 'New review', 2, 2, 2, 2, 'PP00100200311', 'DB02');
+        UPDATE Address SET city = 'Pretoria' WHERE address_id = 17;
+        DELETE FROM StudentTranscriptDirty;
+        """
+    )
+
+    assert (
+        transcripts(plain_conn, 'StudentTranscript')
+        == transcripts(plain_conn, 'StudentTranscriptSource')
+    )
+    plain_conn.close()
@@ -0,0 +1,143 @@
+import pytest
+
+import capstone_project
+from conftest import SQL_SCRIPT
+
+# One write per source table and statement type, each of which must be
+# reflected in the stored transcripts
+WRITES = {
+    'student insert': """
+        INSERT INTO Student
+        VALUES ('NS00100200399', 'New', 'Student', 'ns@email.com', 1)
+        """,
+    'student update': """
+        UPDATE Student SET email = 'peter@email.com'
+        WHERE student_id = 'PP00100200311'
+        """,
+    'student delete': """
+        DELETE FROM Student WHERE student_id = 'PP00100200311'
+        """,
+    'address insert': """
+        DELETE FROM Address WHERE address_id = 17;
+        INSERT INTO Address
+        VALUES (17, 'New Street', 'Durban', 'KZN', '1020', 'South Africa')
+        """,
+    'address update': """
+        UPDATE Address SET city = 'Pretoria' WHERE address_id = 17
+        """,
+    'address delete': """
+        DELETE FROM Address WHERE address_id = 17
+        """,
+    'course insert': """
+        DELETE FROM Course WHERE course_code = 'WD03';
+        INSERT INTO Course
+        VALUES ('WD03', 'Web Servers', 'Servers', 'MP001', 3)
+        """,
+    'course update': """
+        UPDATE Course SET course_name = 'Databases'
+        WHERE course_code = 'DB02'
+        """,
+    'course delete': """
+        DELETE FROM Course WHERE course_code = 'DB02'
+        """,
+    'student course insert': """
+        INSERT INTO StudentCourse VALUES ('PP00100200311', 'DS01', 50, 0)
+        """,
+    'student course update': """
+        UPDATE StudentCourse SET mark = 12, is_complete = 0
+        WHERE student_id = 'PP00100200311' AND course_code = 'DB02'
+        """,
+    'student course delete': """
+        DELETE FROM StudentCourse
+        WHERE student_id = 'PP00100200311' AND course_code = 'DB02'
+        """,
+    'review insert': """
+        INSERT INTO Review (
+        review_id, review_text, completeness, efficiency, style,
+        documentation, student_id, course_code)
+        VALUES (100, 'New review', 2, 2, 2, 2, 'PP00100200311', 'DB02')
+        """,
+    'review update': """
+        UPDATE Review SET review_text = 'Edited', style = 1
+        WHERE review_id = 8
+        """,
+    'review delete': """
+        DELETE FROM Review WHERE review_id = 8
+        """,
+}
+
+
+@pytest.mark.parametrize('statement', WRITES.values(), ids=WRITES.keys())
+def test_write_refreshes_transcript(conn, transcripts, statement):
+    conn.executescript(statement)
+    capstone_project.refreshTranscripts()
+
+    assert (
+        transcripts(conn, 'StudentTranscript')
+        == transcripts(conn, 'StudentTranscriptSource')
+    )
+
+
+def test_transcript_by_student_id(conn, transcripts):
+    source = transcripts(conn, 'StudentTranscriptSource')
+
+    transcript = capstone_project.transcriptByStudentID('PP00100200311')
+
+    for review in source['PP00100200311']['reviews']:
+        del review['text_hash']
+    assert transcript == source['PP00100200311']
+    assert [course['course_code'] for course in transcript['courses']] == [
+        'DB02', 'WD03'
+    ]
+    assert capstone_project.transcriptByStudentID('XX00000000000') is None
+
+
+def test_transcript_build_is_repeatable(conn, transcripts):
+    conn.executescript(SQL_SCRIPT.read_text(encoding='utf-8'))
+
+    assert (
+        transcripts(conn, 'StudentTranscript')
+        == transcripts(conn, 'StudentTranscriptSource')
+    )
+    assert len(transcripts(conn, 'StudentTranscript')) == (
+        conn.execute("SELECT COUNT(*) FROM Student").fetchone()[0]
+    )
+
+
+def test_bulk_load_marks_students_once(conn, transcripts):
+    conn.executemany(
+        """
+        INSERT INTO Review (
+        review_id, review_text, completeness, efficiency, style,
+        documentation, student_id, course_code)
+        VALUES (?, 'Bulk review', 1, 1, 1, 1, 'PP00100200311', 'DB02')
+        """,
+        [(review_id,) for review_id in range(100, 1100)]
+    )
+
+    assert conn.execute(
+        "SELECT student_id FROM StudentTranscriptDirty"
+    ).fetchall() == [('PP00100200311',)]
+
+    capstone_project.refreshTranscripts()
+
+    assert conn.execute(
+        "SELECT COUNT(*) FROM StudentTranscriptDirty"
+    ).fetchone()[0] == 0
+    assert (
+        transcripts(conn, 'StudentTranscript')
+        == transcripts(conn, 'StudentTranscriptSource')
+    )
+
+
+def test_lookup_refreshes_changed_transcript(conn):
+    conn.execute(
+        """
+        UPDATE Student SET email = 'peter@email.com'
+        WHERE student_id = 'PP00100200311'
+        """
+    )
+
+    transcript = capstone_project.transcriptByStudentID('PP00100200311')
+
+    assert transcript['email'] == 'peter@email.com'